@@ -1,4 +1,6 @@
 # Import statements for premade modules
+from utils.startup import mark_startup, startup_report  # Records the startup profile, imported first so timing starts at launch
+import queue  # For checking the prewarm queue without blocking the GUI
 import threading  # Allows us to run modes concurrently in separate threads
 import tkinter as tk  # Provides the GUI framework
 from tkinter import messagebox  # Displays notification pop-ups in the GUI
@@ -8,11 +10,11 @@ from PIL import Image, ImageTk  # Handles video frame processing for displaying
 from multiprocessing import Process, Queue, Value  # Manages separate processes for the camera stream and face recognition
 
 # Import statements for custom modules
-from utils.motors import stop_motors  # Provides functions to control and stop the rover motors
-from modes.manual_control import start_manual_control, stop_manual_control  # Manual control mode logic
-from modes.obstacle_avoidance import start_autonomous_mode, stop_autonomous_mode  # Obstacle avoidance mode logic
-from modes.line_following import start_line_following_mode, stop_line_following_mode  # Line following mode logic
-from utils.camera import camera_stream  # Handles camera feed functionality
+# The mode modules pull in pygame, pyserial and the MotorHat, so they are imported when a mode is first used
+from utils.control import start_control_loop, stop_control_loop, emergency_stop, control_report, reset_control_stats  # Real-time control loop with a deadman
+from utils.camera import camera_stream  # Handles camera feed functionality (OpenCV and dlib load lazily)
+from utils.detections import create_detection_channel, close_detection_channel  # Shares face detections with driving modes
+from utils.governor import start_governor, stop_governor  # Lowers vision quality when control or the SoC is under pressure
 
 # Global variables
 current_thread = None  # Keeps track of the currently active thread for mode execution
@@ -20,7 +22,20 @@ current_mode = None  # Keeps track of the currently active mode
 face_recognition_process = None  # Tracks the process running face recognition (if used)
 frame_queue = Queue(maxsize=10)  # Queue to store video frames for the camera stream
 camera_mode = Value('i', 0)  # Shared value to toggle between simple camera stream and face detection
-camera_process = None  # Tracks the process running the camera stream
+camera_process = None  # Tracks the process running the camera stream, started idle at launch to prewarm the models
+camera_active = Value('i', 0)  # Shared flag: 1 while the camera stream runs, 0 while the camera process idles
+camera_quality = Value('i', 0)  # Shared vision quality level, set by the governor and read by the camera process
+frame_latency = Value('d', 0.0)  # Shared average frame processing time in milliseconds, reported by the camera process
+detection_channel = create_detection_channel()  # Shared memory slot holding the latest face detections from the camera
+prewarm_queue = Queue()  # Receives the prewarm timings and known names from the camera process once its models are loaded
+models_ready = False  # Set once the camera process has finished the prewarm
+PREWARM_POLL_MS = 100  # How often the GUI checks whether the prewarm has finished
+
+# Control loop settings
+CONTROL_DEADMAN_MS = 300  # Motors stop if a mode sends no fresh command within this many milliseconds
+CONTROL_CPUS = {3}  # CPU core the control loop is pinned to (add isolcpus=3 to /boot/cmdline.txt to keep other tasks off it)
+
+mark_startup("imports done")
 
 # Function to stop the current mode
 def stop_current_mode():
@@ -31,17 +46,24 @@ def stop_current_mode():
     if current_thread and current_thread.is_alive():
         # Stop the appropriate mode based on the current mode
         if current_mode == "manual":
+            from modes.manual_control import stop_manual_control
             stop_manual_control()
         elif current_mode == "autonomous":
+            from modes.obstacle_avoidance import stop_autonomous_mode
             stop_autonomous_mode()
         elif current_mode == "line_following":
+            from modes.line_following import stop_line_following_mode
             stop_line_following_mode()
+        elif current_mode == "face_following":
+            from modes.face_following import stop_face_following_mode
+            stop_face_following_mode()
         
         # Wait for the thread to finish
         current_thread.join()
         current_thread = None
         current_mode = None
-        stop_motors()  # Ensure all motors are stopped for safety
+        emergency_stop()  # Ensure all motors are stopped for safety, replacing any command the mode left behind
+        print(control_report())  # Report missed deadlines and worst-case latency for the mode
 
 # Function to start a new mode
 def start_mode(mode_name, mode_function):
@@ -50,6 +72,9 @@ def start_mode(mode_name, mode_function):
     """
     global current_thread, current_mode
     stop_current_mode()  # Ensure no other mode is running
+    # Motor commands from the mode go through the control loop, which stops the motors if the mode stalls
+    start_control_loop(deadman_ms=CONTROL_DEADMAN_MS, realtime=True, cpus=CONTROL_CPUS)
+    reset_control_stats()  # Report timing for this mode only
     current_mode = mode_name
     current_thread = threading.Thread(target=mode_function)  # Create a thread for the new mode
     current_thread.start()  # Start the mode thread
@@ -59,42 +84,113 @@ def switch_to_manual():
     """
     Switch to manual control mode.
     """
+    from modes.manual_control import start_manual_control  # Manual control mode logic
     start_mode("manual", start_manual_control)
 
 def switch_to_autonomous():
     """
     Switch to obstacle avoidance mode.
     """
+    from modes.obstacle_avoidance import start_autonomous_mode  # Obstacle avoidance mode logic
     start_mode("autonomous", start_autonomous_mode)
 
 def switch_to_line_following():
     """
     Switch to line following mode.
     """
+    from modes.line_following import start_line_following_mode  # Line following mode logic
     start_mode("line_following", start_line_following_mode)
 
+def switch_to_face_following():
+    """
+    Switch to face following mode, starting the camera in face detection mode if needed.
+    """
+    from modes.face_following import start_face_following_mode  # Face following mode logic
+    target_name = target_combobox.get()  # Person selected in the GUI
+    camera_mode.value = 1  # Face following needs detections from the camera
+    start_camera_stream()
+    start_mode("face_following", lambda: start_face_following_mode(detection_channel, target_name,
+                                                                        camera_quality, frame_latency))
+
 # Camera-related functions
-def start_camera_stream():
+def launch_camera_process(prewarm=False):
     """
-    Starts the camera stream in a separate process.
+    Starts the camera process idle. It opens the camera once camera_active is set to 1.
+
+    Args:
+        prewarm (bool): Load the face detection models first and report the timings on prewarm_queue.
     """
     global camera_process
-    if camera_process and camera_process.is_alive():
+    camera_process = Process(target=camera_stream, args=(camera_mode, camera_quality, frame_latency, detection_channel,
+                                                          camera_active, prewarm_queue if prewarm else None), daemon=True)
+    camera_process.start()
+
+def start_prewarm():
+    """
+    Starts the camera process idle once the GUI is on screen, so it loads the face detection models.
+    The dlib model load holds the GIL for seconds, so it runs in that process rather than a GUI thread.
+    """
+    mark_startup("GUI ready")
+    launch_camera_process(prewarm=True)
+    root.after(PREWARM_POLL_MS, check_prewarm)
+
+def check_prewarm():
+    """
+    Fills the person selector and enables the camera buttons once the camera process reports that
+    the prewarm has finished, checking again later if it has not. Polling from the GUI loop keeps the window responsive.
+    """
+    global models_ready
+    try:
+        timings, known_names = prewarm_queue.get_nowait()
+    except queue.Empty:
+        if camera_process.is_alive():
+            root.after(PREWARM_POLL_MS, check_prewarm)
+        else:
+            print("Error: Camera process exited before the face detection models were loaded.")
+        return
+
+    models_ready = True
+    mark_startup("models prewarmed")
+    print(startup_report(timings))
+    target_combobox.configure(values=known_names)
+    for button in camera_buttons:
+        button.configure(state="normal")
+
+def start_camera_stream():
+    """
+    Starts the camera stream in the camera process.
+    """
+    if camera_active.value == 1:
         print("Camera stream is already running.")
         return
 
-    camera_process = Process(target=camera_stream, args=(camera_mode,))  # Start the camera stream process
-    camera_process.start()
+    # The camera buttons stay disabled until the prewarm finishes
+    if not models_ready:
+        print("Face detection models are still loading. Try again in a moment.")
+        return
+
+    if not camera_process.is_alive():
+        launch_camera_process()  # The old process exited, so start a fresh one (models load on first use)
+    camera_active.value = 1  # The idle camera process opens the camera
+    start_governor(camera_quality, frame_latency)  # Adjust vision quality while the camera runs
 
 def stop_camera_stream():
     """
-    Stops the camera stream process if it is running.
+    Stops the camera stream. The camera process goes back to idle and keeps its models loaded.
+    """
+    if camera_active.value == 1:
+        camera_active.value = 0  # The feed releases the camera and returns
+        stop_governor()
+        frame_latency.value = 0.0  # Clear the stale reading for the next stream
+        print("Camera stream stopped.")
+
+def close_camera_process():
+    """
+    Ends the camera process when the application exits.
     """
-    global camera_process
     if camera_process and camera_process.is_alive():
         camera_process.terminate()
         camera_process.join()  # Wait for the process to fully stop
-        print("Camera stream stopped.")
 
 def toggle_camera_mode():
     """
@@ -116,7 +212,10 @@ camera_label.grid(row=0, column=1, padx=10, pady=10)  # Position the video feed
 manual_button = ttk.Button(root, text="Manual Control", width=20, command=switch_to_manual)  # Button for manual mode
 autonomous_button = ttk.Button(root, text="Autonomous Mode", width=20, command=switch_to_autonomous)  # Button for obstacle avoidance mode
 line_follow_button = ttk.Button(root, text="Line Following Mode", width=20, command=switch_to_line_following)  # Button for line following mode
-start_cam_button = ttk.Button(root, text="Start Camera", command=start_camera_stream)  # Button to start the camera stream
+face_follow_button = ttk.Button(root, text="Face Following Mode", width=20, command=switch_to_face_following, state="disabled")  # Button for face following mode
+target_combobox = ttk.Combobox(root, values=[], state="readonly", width=20)  # Person to follow, filled by check_prewarm()
+start_cam_button = ttk.Button(root, text="Start Camera", command=start_camera_stream, state="disabled")  # Button to start the camera stream
+camera_buttons = [start_cam_button, face_follow_button]  # Enabled by check_prewarm() once the face models are loaded
 stop_cam_button = ttk.Button(root, text="Stop Camera", command=stop_camera_stream)  # Button to stop the camera stream
 toggle_cam_button = ttk.Button(root, text="Toggle Camera Mode", command=toggle_camera_mode)  # Button to toggle between camera modes
 
@@ -124,9 +223,21 @@ toggle_cam_button = ttk.Button(root, text="Toggle Camera Mode", command=toggle_c
 manual_button.grid(row=0, column=0, padx=10, pady=10)  # Place the manual mode button
 autonomous_button.grid(row=1, column=0, padx=10, pady=10)  # Place the obstacle avoidance button
 line_follow_button.grid(row=2, column=0, padx=10, pady=10)  # Place the line following button
+face_follow_button.grid(row=3, column=0, padx=10, pady=10)  # Place the face following button
+target_combobox.grid(row=4, column=0, padx=10, pady=10)  # Place the person selector
 start_cam_button.grid(row=5, column=0, padx=10, pady=10)  # Place the start camera button
 stop_cam_button.grid(row=5, column=1, padx=10, pady=10)  # Place the stop camera button
 toggle_cam_button.grid(row=5, column=2, padx=10, pady=10)  # Place the toggle camera mode button
 
+# Prewarm the face detection models once the window has been drawn
+root.after_idle(start_prewarm)
+
 # Start the main loop
 root.mainloop()  # Run the GUI loop, allowing the user to interact with the interface
+
+# Clean up once the window is closed
+stop_current_mode()
+stop_control_loop()  # Ends the real-time thread and restores the GIL switch interval
+stop_camera_stream()
+close_camera_process()
+close_detection_channel(detection_channel)  # Free the shared memory
@@ -0,0 +1,222 @@
+import time  # For the loop period and detection timestamps
+from utils.control import send_command, emergency_stop  # Sends motor commands to the control loop
+from utils.detections import read_detections  # Latest detections published by the camera process
+from utils.camera import quality_settings  # Detection cadence and frame rate chosen by the quality governor
+from utils.governor import QUALITY_LEVELS  # Quality levels, used when the current level is unknown
+
+# Face following settings
+FOLLOW_PERIOD = 0.02  # Seconds between steering updates (50 Hz, faster than detection runs)
+TURN_DEADBAND = 0.12  # Horizontal offset from the frame center, as a fraction of its width, treated as centered
+TARGET_WIDTH = 0.25  # Face width, as a fraction of the frame width, at which the rover stops approaching
+LOST_DETECTION_PERIODS = 3  # Detection periods without seeing the target before the rover stops
+MIN_LOST_TIMEOUT = 0.5  # Shortest time in seconds without seeing the target before the rover stops
+FOLLOW_SPEED = 0.8  # Speed for driving toward the target
+TURN_SPEED = 0.8  # Speed for turning toward the target
+
+# Alpha-beta filter gains for smoothing the target's position between detections
+POSITION_GAIN = 0.5  # How far the estimate moves toward each new measurement (0 to 1)
+VELOCITY_GAIN = 0.1  # How strongly each measurement corrects the estimated sideways velocity
+
+# Global variables
+running = True  # Flag to indicate whether the face following mode is active
+
+def find_target(faces, target_name):
+    """
+    Find the target person among the detected faces.
+
+    Args:
+        faces (list): (name, (top, right, bottom, left)) pairs with coordinates as fractions of the frame.
+        target_name (str): Name of the person to follow.
+
+    Returns:
+        tuple: (center_x, width) of the target's face as fractions of the frame width,
+               or None if the target is not in view. The largest match wins if there are several.
+    """
+    best = None
+    for name, (top, right, bottom, left) in faces:
+        if name != target_name:
+            continue
+        width = right - left
+        if best is None or width > best[1]:
+            best = ((left + right) / 2.0, width)
+    return best
+
+def update_tracker(tracker, center_x, width, capture_time):
+    """
+    Update the smoothed target estimate with a new detection using an alpha-beta filter.
+
+    Args:
+        tracker (dict): Current estimate with "x", "velocity", "width" and "time", or None.
+        center_x (float): Measured face center as a fraction of the frame width.
+        width (float): Measured face width as a fraction of the frame width.
+        capture_time (float): time.monotonic() value when the frame was captured.
+
+    Returns:
+        dict: The updated estimate.
+    """
+    if tracker is None:
+        return {"x": center_x, "velocity": 0.0, "width": width, "time": capture_time}
+
+    elapsed = capture_time - tracker["time"]
+    if elapsed <= 0:
+        return tracker  # Older or duplicate frame
+
+    predicted_x = tracker["x"] + tracker["velocity"] * elapsed
+    residual = center_x - predicted_x
+    return {
+        "x": predicted_x + POSITION_GAIN * residual,
+        "velocity": tracker["velocity"] + VELOCITY_GAIN * residual / elapsed,
+        "width": tracker["width"] + POSITION_GAIN * (width - tracker["width"]),
+        "time": capture_time,
+    }
+
+def detection_interval(quality, frame_latency):
+    """
+    Estimate the time between detections in the camera process.
+    Detection runs every "cadence" frames, and each frame takes the longer of the frame rate limit
+    and the measured frame processing time.
+
+    Args:
+        quality (Value): Shared index into QUALITY_LEVELS, or None to assume the lightest level.
+        frame_latency (Value): Shared average frame processing time in milliseconds, or None.
+
+    Returns:
+        float: Estimated seconds between detections.
+    """
+    settings = quality_settings(quality) if quality is not None else QUALITY_LEVELS[-1]
+    frame_time = 1.0 / settings["fps"]
+    if frame_latency is not None:
+        frame_time = max(frame_time, frame_latency.value / 1000.0)
+    return settings["cadence"] * frame_time
+
+def lost_timeout(interval):
+    """
+    Time without seeing the target before the rover stops, long enough to ride out a few detection periods.
+
+    Args:
+        interval (float): Seconds between detections, from detection_interval().
+
+    Returns:
+        float: Timeout in seconds.
+    """
+    return max(MIN_LOST_TIMEOUT, LOST_DETECTION_PERIODS * interval)
+
+def predict_position(tracker, now, max_horizon):
+    """
+    Predict where the target's face is now, since detections arrive less often than steering updates.
+
+    Args:
+        tracker (dict): Current estimate from update_tracker().
+        now (float): time.monotonic() value to predict for.
+        max_horizon (float): Longest time in seconds to extrapolate past the last detection.
+
+    Returns:
+        float: Predicted face center as a fraction of the frame width, from 0.0 to 1.0.
+    """
+    elapsed = min(now - tracker["time"], max_horizon)  # Do not extrapolate far past the last detection
+    return min(max(tracker["x"] + tracker["velocity"] * elapsed, 0.0), 1.0)
+
+def choose_command(center_x, width):
+    """
+    Decide how to drive toward the target.
+
+    Args:
+        center_x (float): Face center as a fraction of the frame width.
+        width (float): Face width as a fraction of the frame width.
+
+    Returns:
+        tuple: (action, speed) for send_command().
+    """
+    offset = center_x - 0.5
+    if offset < -TURN_DEADBAND:
+        return "left", TURN_SPEED
+    if offset > TURN_DEADBAND:
+        return "right", TURN_SPEED
+    if width < TARGET_WIDTH:
+        return "forward", FOLLOW_SPEED
+    return "stop", 0.0  # Close enough, wait here
+
+def process_face_following_logic(detections, target_name, quality=None, frame_latency=None):
+    """
+    Core logic for following a recognized person.
+    - Reads the latest detections from the camera process without blocking it.
+    - Smooths the target's position and predicts it between detections.
+    - Steers toward the target, or stops if the target has not been seen recently.
+
+    Args:
+        detections (SharedMemory): Detection channel the camera process publishes to.
+        target_name (str): Name of the person to follow.
+        quality (Value): Shared quality level, used to estimate how often detections arrive.
+        frame_latency (Value): Shared average frame processing time in milliseconds.
+    """
+    tracker = None  # Smoothed estimate of the target's position
+    last_seq = None  # Sequence number of the last detections processed
+
+    while running:  # Continue running as long as the mode is active
+        loop_start = time.monotonic()
+        origin_time = None  # Capture time of a new detection, for measuring glass-to-motor latency
+
+        # Pick up new detections, if the camera has published any since the last update
+        latest = read_detections(detections)
+        if latest and latest["seq"] != last_seq:
+            last_seq = latest["seq"]
+            target = find_target(latest["faces"], target_name)
+            if target:
+                tracker = update_tracker(tracker, target[0], target[1], latest["capture_time"])
+                origin_time = latest["capture_time"]
+
+        # The governor can slow detection down, so the timeout follows the current detection rate
+        interval = detection_interval(quality, frame_latency)
+        now = time.monotonic()
+        if tracker is None or now - tracker["time"] > lost_timeout(interval):
+            # Target not seen recently, so stop and start tracking from scratch when it reappears
+            tracker = None
+            send_command("stop")
+        else:
+            action, speed = choose_command(predict_position(tracker, now, interval), tracker["width"])
+            send_command(action, speed, origin_time=origin_time)  # Predicted commands between detections are not timed
+
+        # Sleep for the rest of the period
+        remaining = FOLLOW_PERIOD - (time.monotonic() - loop_start)
+        if remaining > 0:
+            time.sleep(remaining)
+
+def start_face_following_mode(detections, target_name, quality=None, frame_latency=None):
+    """
+    Start the face following mode.
+    The camera must be running in face detection mode and publishing to the detection channel.
+
+    Args:
+        detections (SharedMemory): Detection channel the camera process publishes to.
+        target_name (str): Name of the person to follow, as stored in the face encodings file.
+        quality (Value): Shared quality level set by the governor, or None to assume the lightest level.
+        frame_latency (Value): Shared average frame processing time in milliseconds, or None.
+    """
+    global running
+    running = True  # Set the running flag to True
+
+    if not target_name:
+        print("No person selected. Unable to start face following mode.")
+        return
+    print(f"Following {target_name}.")
+
+    try:
+        process_face_following_logic(detections, target_name, quality, frame_latency)
+    except KeyboardInterrupt:
+        # Handle interruptions gracefully (e.g., Ctrl+C)
+        print("\nExiting face following mode...")
+    finally:
+        # Ensure motors are stopped
+        emergency_stop()
+        stop_face_following_mode()
+
+def stop_face_following_mode():
+    """
+    Stop the face following mode.
+    - Stops the rover's motors.
+    - Sets the running flag to False.
+    """
+    global running
+    running = False  # Set the running flag to False to exit the loop
+    emergency_stop()  # Ensure the motors are stopped
+    print("Face following mode stopped.")
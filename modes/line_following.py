@@ -1,6 +1,6 @@
 import time
 import serial
-from utils.motors import move_forward, stop_motors, turn_left, turn_right
+from utils.control import send_command, emergency_stop
 
 # Global variables
 running = True  # Flag to indicate whether the line-following mode is active
@@ -60,23 +60,23 @@ def process_line_following_logic():
         # Check if the sensor data is valid
         if left_sensor is None or center_sensor is None or right_sensor is None:
             print("No valid sensor data received. Stopping motors.")
-            stop_motors()  # Stop the rover for safety
+            send_command("stop")  # Stop the rover for safety
             time.sleep(0.1)  # Add a small delay before retrying
             continue
 
         # Process the sensor values to determine movement
         if center_sensor == 1:
             # Move forward if the line is centered
-            move_forward(1)
+            send_command("forward", 1)
         elif left_sensor == 1 and center_sensor == 0:
             # Turn left if the line is on the left
-            turn_left(0.8)
+            send_command("left", 0.8)
         elif right_sensor == 1 and center_sensor == 0:
             # Turn right if the line is on the right
-            turn_right(0.8)
+            send_command("right", 0.8)
         else:
             # Stop if no line is detected
-            stop_motors()
+            send_command("stop")
         
         time.sleep(0.1)  # Add a small delay for stability
 
@@ -102,7 +102,7 @@ def start_line_following_mode():
         print("\nExiting line-following mode...")
     finally:
         # Ensure motors are stopped and clean up resources
-        stop_motors()
+        emergency_stop()
         stop_line_following_mode()
 
 def stop_line_following_mode():
@@ -117,5 +117,5 @@ def stop_line_following_mode():
     if ser:  # Check if the serial connection is active
         ser.close()  # Close the serial connection
         print("Serial connection closed.")
-    stop_motors()  # Ensure the motors are stopped
+    emergency_stop()  # Ensure the motors are stopped
     print("Line-following mode stopped.")
\ No newline at end of file
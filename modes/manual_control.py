@@ -1,5 +1,4 @@
-import pygame  # For joystick input handling
-from utils.motors import move_forward, move_backward, turn_left, turn_right, stop_motors  # Motor control functions
+from utils.control import send_command, emergency_stop  # Sends motor commands to the control loop
 import time  # For adding delays to prevent overloading the CPU
 
 # Define speed settings
@@ -17,6 +16,7 @@ def start_manual_control():
     the rover's movement and speed using joystick inputs.
     """
     global running, current_speed
+    import pygame  # For joystick input handling, imported here to keep application startup fast
     pygame.init()  # Initialize all imported Pygame modules
 
     # Check if a joystick is connected
@@ -52,22 +52,22 @@ def start_manual_control():
 
             # Handle forward and backward movement using triggers
             if joystick.get_button(7):  # Right trigger pressed (Forward)
-                move_forward(current_speed)
+                send_command("forward", current_speed)
             elif joystick.get_button(6):  # Left trigger pressed (Backward)
-                move_backward(current_speed)
+                send_command("backward", current_speed)
             elif abs(axis_x) > deadzone:  # Turning when joystick is moved left or right
                 if axis_x > 0:  # Turn right
-                    turn_right(current_speed)
+                    send_command("right", current_speed)
                 elif axis_x < 0:  # Turn left
-                    turn_left(current_speed)
+                    send_command("left", current_speed)
             else:
-                stop_motors()  # Stop motors when joystick is neutral
+                send_command("stop")  # Stop motors when joystick is neutral
 
             time.sleep(0.01)  # Add a small delay to prevent CPU overload
 
     except KeyboardInterrupt:
         # Stop the rover safely if the user interrupts (e.g., Ctrl+C)
-        stop_motors()
+        emergency_stop()
         print("\nExiting manual control mode...")
 
 def stop_manual_control():
@@ -77,5 +77,5 @@ def stop_manual_control():
     """
     global running
     running = False  # Stop the main control loop
-    stop_motors()  # Ensure the rover stops
+    emergency_stop()  # Ensure the rover stops
     print("Manual control mode stopped.")
@@ -1,6 +1,9 @@
 import time  # For delays and timing logic
 import serial  # For serial communication with the Arduino
-from utils.motors import move_forward, move_backward, stop_motors, turn_left, turn_right  # Motor control functions
+from utils.control import send_command, emergency_stop, hold_command  # Sends motor commands to the control loop
+
+# Time to hold a stop before changing direction, long enough for the control loop to apply it
+STOP_PAUSE = 0.05
 
 # Global variables
 running = True  # Flag to indicate whether the autonomous mode is active
@@ -57,27 +60,23 @@ def process_autonomous_logic():
 
         # Process the received direction and execute the corresponding action
         if direction == "Clear":
-            move_forward(1)  # Move forward at full speed
-            time.sleep(0.5)  # Maintain forward movement for a short duration
+            hold_command("forward", 1, 0.5)  # Move forward at full speed for a short duration
         elif direction == "L":
-            stop_motors()  # Stop first before turning
-            turn_left(0.8)  # Turn left at 80% speed
-            time.sleep(0.5)  # Delay for turning
+            hold_command("stop", 0.0, STOP_PAUSE)  # Stop first before turning
+            hold_command("left", 0.8, 0.5)  # Turn left at 80% speed for a short duration
         elif direction == "R":
-            stop_motors()  # Stop first before turning
-            turn_right(0.8)  # Turn right at 80% speed
-            time.sleep(0.5)  # Delay for turning
+            hold_command("stop", 0.0, STOP_PAUSE)  # Stop first before turning
+            hold_command("right", 0.8, 0.5)  # Turn right at 80% speed for a short duration
         elif direction == "B":
-            stop_motors()  # Stop first before reversing
-            move_backward(0.8)  # Move backward at 80% speed
-            time.sleep(0.5)  # Delay for reversing
+            hold_command("stop", 0.0, STOP_PAUSE)  # Stop first before reversing
+            hold_command("backward", 0.8, 0.5)  # Move backward at 80% speed for a short duration
         elif direction == "Obstructed":
-            stop_motors()  # Stop all motors
+            send_command("stop")  # Stop all motors
             print("Obstacle detected in all directions. Waiting...")
             time.sleep(0.5)  # Pause to allow the Arduino to reevaluate the surroundings
         else:
             # Handle unknown or invalid commands
-            stop_motors()
+            send_command("stop")
             print("Unknown direction received, stopping motors.")
 
 def start_autonomous_mode():
@@ -102,7 +101,7 @@ def start_autonomous_mode():
         print("\nExiting autonomous mode...")
     finally:
         # Ensure motors are stopped and clean up resources
-        stop_motors()
+        emergency_stop()
         stop_autonomous_mode()
 
 def stop_autonomous_mode():
@@ -117,5 +116,5 @@ def stop_autonomous_mode():
     if ser:  # Check if the serial connection is active
         ser.close()  # Close the serial connection
         print("Serial connection closed.")
-    stop_motors()  # Ensure all motors are stopped
+    emergency_stop()  # Ensure all motors are stopped
     print("Autonomous mode stopped.")
@@ -0,0 +1,135 @@
+import threading  # For generating artificial CPU load
+import time  # For waiting on the control loop
+import utils.motors  # Holds the shared MotorHat instance, restored after each test
+from utils.motors import use_simulated_motors  # Simulated MotorHat for testing without hardware
+from utils.control import (start_control_loop, stop_control_loop, send_command, emergency_stop, get_control_stats,
+                           reset_control_stats)
+
+def wait_for_stats(key, value, timeout=1.0):
+    """
+    Wait until a control loop statistic reaches a value, or the timeout passes.
+    """
+    end_time = time.perf_counter() + timeout
+    while get_control_stats()[key] < value and time.perf_counter() < end_time:
+        time.sleep(0.01)
+
+def busy_loop(stop_event):
+    """
+    Keep the CPU (and the GIL) busy until stop_event is set.
+    """
+    while not stop_event.is_set():
+        sum(range(1000))
+
+def throttles(kit):
+    """
+    Return the throttles of the four simulated motors.
+    """
+    return [kit.motor1.throttle, kit.motor2.throttle, kit.motor3.throttle, kit.motor4.throttle]
+
+def test_deadman_under_load():
+    """
+    Check that commands reach the motors and that the deadman stops them
+    when commands stop arriving, while other threads load the CPU.
+    """
+    original_kit = utils.motors.kit
+    kit = use_simulated_motors()
+    stop_event = threading.Event()
+    load_threads = [threading.Thread(target=busy_loop, args=(stop_event,)) for _ in range(2)]
+    for thread in load_threads:
+        thread.start()
+
+    try:
+        start_control_loop(period_ms=10, deadman_ms=300)
+
+        # Keep sending fresh commands, as a mode would
+        for _ in range(20):
+            send_command("forward", 0.5)
+            time.sleep(0.01)
+        time.sleep(0.1)  # Give the control loop time to pick up the last command
+        assert throttles(kit) == [0.5, 0.5, 0.5, 0.5]
+
+        # Stop sending commands, as a stalled mode would
+        time.sleep(1.0)
+        assert throttles(kit) == [0.0, 0.0, 0.0, 0.0]
+
+        stats = get_control_stats()
+        assert stats["deadman_trips"] >= 1
+        assert stats["commands_applied"] > 0
+        assert stats["worst_command_latency_ms"] > 0.0
+    finally:
+        stop_event.set()
+        for thread in load_threads:
+            thread.join()
+        stop_control_loop()
+        utils.motors.kit = original_kit  # Do not leave the simulated motors in place for other tests
+
+    assert throttles(kit) == [0.0, 0.0, 0.0, 0.0]
+
+def test_stop_does_not_trip_deadman():
+    """
+    Check that a deliberate stop left in place longer than the deadman timeout
+    is not counted as a deadman trip.
+    """
+    original_kit = utils.motors.kit
+    kit = use_simulated_motors()
+    try:
+        start_control_loop(period_ms=10, deadman_ms=100)
+        send_command("stop")
+        wait_for_stats("commands_applied", 1)
+        time.sleep(0.6)  # Idle well past the deadman timeout
+
+        assert throttles(kit) == [0.0, 0.0, 0.0, 0.0]
+        assert get_control_stats()["deadman_trips"] == 0
+    finally:
+        stop_control_loop()
+        utils.motors.kit = original_kit  # Do not leave the simulated motors in place for other tests
+
+def test_command_after_emergency_stop():
+    """
+    Check that a mode switch, which stops the motors outside the loop and then
+    immediately resends the same command, drives the motors again.
+    """
+    original_kit = utils.motors.kit
+    kit = use_simulated_motors()
+    try:
+        start_control_loop(period_ms=10, deadman_ms=300)
+        send_command("forward", 0.8)
+        wait_for_stats("commands_applied", 1)
+        time.sleep(0.05)
+        assert throttles(kit) == [0.8, 0.8, 0.8, 0.8]
+
+        # The old mode stops, and the new mode sends its first command before the next tick
+        emergency_stop()
+        send_command("forward", 0.8)
+        assert throttles(kit) == [0.0, 0.0, 0.0, 0.0]
+
+        for _ in range(10):
+            send_command("forward", 0.8)
+            time.sleep(0.01)
+        assert throttles(kit) == [0.8, 0.8, 0.8, 0.8]
+    finally:
+        stop_control_loop()
+        utils.motors.kit = original_kit  # Do not leave the simulated motors in place for other tests
+
+def test_glass_to_motor_only_on_motor_writes():
+    """
+    Check that a detection repeating the command already on the motors does not count
+    toward glass-to-motor latency, since the loop skips the motor write.
+    """
+    original_kit = utils.motors.kit
+    use_simulated_motors()
+    try:
+        start_control_loop(period_ms=10, deadman_ms=300)
+        reset_control_stats()
+        send_command("forward", 0.8, origin_time=time.monotonic())
+        wait_for_stats("commands_applied", 1)
+        first = get_control_stats()["last_glass_to_motor_ms"]
+        assert first is not None and first < 1000.0
+
+        # Same command from an old frame: the motors are not written, so the measurement stands
+        send_command("forward", 0.8, origin_time=time.monotonic() - 5.0)
+        wait_for_stats("commands_applied", 2)
+        assert get_control_stats()["last_glass_to_motor_ms"] == first
+    finally:
+        stop_control_loop()
+        utils.motors.kit = original_kit  # Do not leave the simulated motors in place for other tests
@@ -0,0 +1,84 @@
+import struct  # For corrupting the sequence number like an interrupted writer would
+import time  # For capture timestamps
+from multiprocessing import Process  # For publishing from another process, like the camera does
+from utils.detections import create_detection_channel, close_detection_channel, publish_detections, read_detections, MAX_FACES
+
+def publish_frames(channel, frames):
+    """
+    Publish a number of frames with one face each, moving left to right.
+    """
+    for index in range(frames):
+        publish_detections(channel, [((100, 200 + index, 300, 100 + index), "Lexa Vanvickle")], time.monotonic(), 640, 480)
+
+def test_publish_and_read():
+    """
+    Check that detections come back with normalized boxes and an even, increasing sequence number.
+    """
+    channel = create_detection_channel()
+    try:
+        assert read_detections(channel) is None  # Nothing published yet
+
+        capture_time = time.monotonic()
+        faces = [((120, 320, 240, 160), "Lexa Vanvickle"), ((0, 64, 96, 0), "Unknown")]
+        publish_detections(channel, faces, capture_time, 640, 480)
+
+        latest = read_detections(channel)
+        assert latest["seq"] == 2
+        assert latest["capture_time"] == capture_time
+        assert latest["publish_time"] >= capture_time
+        assert (latest["frame_width"], latest["frame_height"]) == (640, 480)
+        assert latest["faces"][0] == ("Lexa Vanvickle", (0.25, 0.5, 0.5, 0.25))
+        assert latest["faces"][1][0] == "Unknown"
+
+        # Extra faces beyond the slot size are dropped
+        publish_detections(channel, faces * MAX_FACES, capture_time, 640, 480)
+        latest = read_detections(channel)
+        assert latest["seq"] == 4
+        assert len(latest["faces"]) == MAX_FACES
+    finally:
+        close_detection_channel(channel)
+
+def test_recover_from_interrupted_publish():
+    """
+    Check that publishing recovers when a previous writer was killed mid-publish
+    and left an odd sequence number behind.
+    """
+    channel = create_detection_channel()
+    try:
+        struct.pack_into("=Q", channel.buf, 0, 5)  # Odd sequence: write never finished
+        assert read_detections(channel) is None
+
+        publish_detections(channel, [((120, 320, 240, 160), "Lexa Vanvickle")], time.monotonic(), 640, 480)
+        latest = read_detections(channel)
+        assert latest["seq"] == 8
+        assert latest["faces"][0][0] == "Lexa Vanvickle"
+    finally:
+        close_detection_channel(channel)
+
+def test_read_from_other_process():
+    """
+    Check that a reader sees consistent detections while another process keeps publishing.
+    """
+    channel = create_detection_channel()
+    try:
+        writer = Process(target=publish_frames, args=(channel, 2000))
+        writer.start()
+
+        last_seq = 0
+        while writer.is_alive():
+            latest = read_detections(channel)
+            if latest is None:
+                continue
+            assert latest["seq"] % 2 == 0
+            assert latest["seq"] >= last_seq
+            last_seq = latest["seq"]
+
+            # Every field of a face comes from the same write
+            name, (top, right, bottom, left) = latest["faces"][0]
+            assert name == "Lexa Vanvickle"
+            assert abs((right - left) * 640 - 100) < 1e-3
+        writer.join()
+
+        assert read_detections(channel)["seq"] == 4000
+    finally:
+        close_detection_channel(channel)
@@ -0,0 +1,71 @@
+from modes.face_following import (find_target, update_tracker, predict_position, choose_command,
+                                  lost_timeout, TURN_DEADBAND, TARGET_WIDTH, MIN_LOST_TIMEOUT)  # Face following logic
+
+def test_find_target_picks_largest_match():
+    """
+    Check that only the chosen person is considered and the largest matching face wins.
+    """
+    faces = [
+        ("Unknown", (0.1, 0.9, 0.9, 0.1)),  # Biggest face, but not the target
+        ("Lexa Vanvickle", (0.2, 0.3, 0.4, 0.1)),  # Small, distant match
+        ("Lexa Vanvickle", (0.2, 0.8, 0.6, 0.4)),  # Larger, closer match
+    ]
+    center_x, width = find_target(faces, "Lexa Vanvickle")
+    assert abs(center_x - 0.6) < 1e-9
+    assert abs(width - 0.4) < 1e-9
+
+    assert find_target(faces, "Keanu Reeves") is None
+    assert find_target([], "Lexa Vanvickle") is None
+
+def test_update_tracker_ignores_old_frames():
+    """
+    Check that duplicate and out-of-order frames leave the estimate unchanged.
+    """
+    tracker = update_tracker(None, 0.5, 0.2, 10.0)
+    tracker = update_tracker(tracker, 0.6, 0.2, 10.5)
+
+    assert update_tracker(tracker, 0.9, 0.4, 10.5) is tracker  # Duplicate frame
+    assert update_tracker(tracker, 0.1, 0.1, 10.2) is tracker  # Older frame arriving late
+
+def test_update_tracker_smooths_and_learns_velocity():
+    """
+    Check that the estimate moves part of the way toward a new measurement
+    and picks up the direction the target is moving in.
+    """
+    tracker = update_tracker(None, 0.5, 0.2, 10.0)
+    tracker = update_tracker(tracker, 0.7, 0.3, 10.5)
+
+    assert 0.5 < tracker["x"] < 0.7
+    assert 0.2 < tracker["width"] < 0.3
+    assert tracker["velocity"] > 0.0
+    assert tracker["time"] == 10.5
+
+def test_predict_position_is_clamped():
+    """
+    Check that prediction stays within the frame and stops extrapolating past the horizon.
+    """
+    tracker = {"x": 0.9, "velocity": 2.0, "width": 0.2, "time": 10.0}
+    assert predict_position(tracker, 11.0, 1.0) == 1.0
+
+    tracker = {"x": 0.1, "velocity": -2.0, "width": 0.2, "time": 10.0}
+    assert predict_position(tracker, 11.0, 1.0) == 0.0
+
+    tracker = {"x": 0.5, "velocity": 0.1, "width": 0.2, "time": 10.0}
+    assert abs(predict_position(tracker, 20.0, 1.0) - 0.6) < 1e-9  # Capped at one second of motion
+
+def test_choose_command():
+    """
+    Check the deadband around the frame center and the approach width.
+    """
+    assert choose_command(0.5 - TURN_DEADBAND - 0.01, 0.1)[0] == "left"
+    assert choose_command(0.5 + TURN_DEADBAND + 0.01, 0.1)[0] == "right"
+    assert choose_command(0.5 + TURN_DEADBAND - 0.01, 0.1)[0] == "forward"  # Inside the deadband
+    assert choose_command(0.5, TARGET_WIDTH - 0.01)[0] == "forward"
+    assert choose_command(0.5, TARGET_WIDTH) == ("stop", 0.0)  # Close enough
+
+def test_lost_timeout_follows_detection_rate():
+    """
+    Check that slow detection extends the lost timeout, and fast detection keeps the minimum.
+    """
+    assert lost_timeout(0.01) == MIN_LOST_TIMEOUT
+    assert lost_timeout(0.5) > 0.5 * 2  # Rides out more than a couple of slow detection periods
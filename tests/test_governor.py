@@ -0,0 +1,62 @@
+from utils.governor import decide_quality, QUALITY_LEVELS, UPGRADE_AFTER, DOWNGRADE_COOLDOWN  # Quality governor decision logic
+
+# Measurements with no pressure at all
+CALM_SIGNALS = {"control_overruns": 0, "temperature": 50.0, "cpu_load": 0.2, "frame_latency_ms": 30.0}
+
+def test_control_overruns_win():
+    """
+    Check that missed control deadlines lower quality even when everything else is calm,
+    and even while waiting out a previous downgrade.
+    """
+    level, calm_intervals, _, reason = decide_quality(0, UPGRADE_AFTER - 1, 0, dict(CALM_SIGNALS, control_overruns=1))
+    assert level > 0
+    assert calm_intervals == 0
+
+    new_level, _, _, _ = decide_quality(level, 0, DOWNGRADE_COOLDOWN, dict(CALM_SIGNALS, control_overruns=1))
+    assert new_level > level
+
+    # Quality never drops past the lightest level
+    lowest_quality = len(QUALITY_LEVELS) - 1
+    level, _, _, _ = decide_quality(lowest_quality, 0, 0, dict(CALM_SIGNALS, control_overruns=5))
+    assert level == lowest_quality
+
+def test_upgrade_hysteresis():
+    """
+    Check that quality only rises after enough calm intervals in a row,
+    and that readings between the thresholds hold the level.
+    """
+    level, calm_intervals, cooldown = 2, 0, 0
+    for _ in range(UPGRADE_AFTER - 1):
+        level, calm_intervals, cooldown, _ = decide_quality(level, calm_intervals, cooldown, CALM_SIGNALS)
+    assert level == 2
+
+    # A reading between the low and high thresholds restarts the count
+    level, calm_intervals, cooldown, _ = decide_quality(level, calm_intervals, cooldown, dict(CALM_SIGNALS, temperature=70.0))
+    assert (level, calm_intervals) == (2, 0)
+
+    for _ in range(UPGRADE_AFTER):
+        level, calm_intervals, cooldown, _ = decide_quality(level, calm_intervals, cooldown, CALM_SIGNALS)
+    assert level == 1
+
+def test_thermal_pressure():
+    """
+    Check that a hot SoC lowers quality by one level.
+    """
+    level, _, _, reason = decide_quality(1, 0, 0, dict(CALM_SIGNALS, temperature=78.0))
+    assert level == 2
+    assert reason == "SoC temperature high"
+
+def test_sustained_thermal_pressure():
+    """
+    Check that a SoC that stays hot lowers quality one level per cooldown,
+    instead of one level per interval while the temperature catches up.
+    """
+    hot = dict(CALM_SIGNALS, temperature=76.0)
+    level, calm_intervals, cooldown = 0, 0, 0
+    levels = []
+    for _ in range(2 * (DOWNGRADE_COOLDOWN + 1)):
+        level, calm_intervals, cooldown, _ = decide_quality(level, calm_intervals, cooldown, hot)
+        levels.append(level)
+
+    assert levels[:DOWNGRADE_COOLDOWN + 1] == [1] * (DOWNGRADE_COOLDOWN + 1)
+    assert levels[DOWNGRADE_COOLDOWN + 1:] == [2] * (DOWNGRADE_COOLDOWN + 1)
@@ -0,0 +1,23 @@
+import os  # For locating the project root
+import subprocess  # Imports are checked in a fresh interpreter so other tests cannot affect sys.modules
+import sys  # For the current Python interpreter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the GUI imports at startup, and the slow libraries they must not pull in
+STARTUP_MODULES = ["utils.camera", "utils.motors", "utils.control", "modes.face_following"]
+HEAVY_MODULES = ["cv2", "face_recognition", "pygame", "adafruit_motorkit"]
+
+def test_startup_imports_stay_lazy():
+    """
+    Check that importing the startup modules does not load OpenCV, face_recognition,
+    pygame or the MotorHat library, which would slow down the GUI launch.
+    """
+    script = (
+        "import sys\n"
+        + "".join(f"import {module}\n" for module in STARTUP_MODULES)
+        + f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
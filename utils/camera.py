@@ -1,13 +1,169 @@
-import cv2  # OpenCV library for camera and image processing
 from multiprocessing import Process, Value  # For running processes and shared variables
-import face_recognition  # Library for face detection and recognition
 import json  # For loading and parsing face encodings from a JSON file
+import os  # For locating the Haar cascade file
+import time  # For timing the model prewarm, frame latency and frame rate limiting
+from utils.governor import QUALITY_LEVELS  # Detection and stream settings chosen by the quality governor
+from utils.detections import publish_detections  # Shares detections with driving modes
 
-def simple_camera_feed():
+# OpenCV and face_recognition (dlib and its models) are slow to import, so they are
+# imported inside the functions that need them. prewarm_models() loads them ahead of time.
+
+# Haar cascade used by the lightweight detector backend
+HAAR_CASCADE_FILE = os.path.join(os.path.dirname(__file__), "haarcascades", "haarcascade_frontalface_default.xml")
+# Face gallery generated by data/face_encoding.py, found relative to the project rather than the working directory
+KNOWN_FACES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "face_encodings.json")
+LATENCY_SMOOTHING = 0.2  # Weight of the newest frame in the reported frame latency average
+IDLE_POLL = 0.05  # Seconds between checks for a start request while the camera process idles
+
+# Cache of known faces so the JSON file is only parsed once per process
+known_faces_cache = {}  # Maps file path to a (names, encodings) tuple
+
+def load_known_faces(known_faces_file=KNOWN_FACES_FILE):
+    """
+    Load known face names and encodings from a JSON file, caching the result.
+
+    Args:
+        known_faces_file (str): Path to the JSON file containing known face encodings.
+
+    Returns:
+        tuple: (known_names, known_encodings) lists. Both are empty if the file is missing.
+    """
+    if known_faces_file in known_faces_cache:
+        return known_faces_cache[known_faces_file]
+
+    known_names, known_encodings = [], []
+    try:
+        with open(known_faces_file, "r") as f:
+            data = json.load(f)
+            for entry in data:
+                known_names.append(entry["name"])
+                known_encodings.append(entry["encoding"])
+    except FileNotFoundError:
+        print("No face encodings file found. Starting detection-only mode.")  # Fallback to detection without recognition
+
+    known_faces_cache[known_faces_file] = (known_names, known_encodings)
+    return known_names, known_encodings
+
+def prewarm_models(known_faces_file=KNOWN_FACES_FILE):
+    """
+    Import OpenCV and face_recognition, run the detector once and load the face gallery.
+    Meant to run in the camera process as soon as it starts, so the dlib model load
+    holds that process's GIL instead of freezing the GUI.
+
+    Args:
+        known_faces_file (str): Path to the JSON file containing known face encodings.
+
+    Returns:
+        dict: Seconds spent on each step, keyed by step name.
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    import cv2  # OpenCV library for camera and image processing
+    timings["import cv2"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    import face_recognition  # Importing this loads the dlib detector, landmark and encoder models
+    timings["import face_recognition"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    import numpy as np  # Installed alongside face_recognition
+    face_recognition.face_locations(np.zeros((64, 64, 3), dtype=np.uint8))  # First call initializes the detector
+    timings["detector warmup"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    load_known_faces(known_faces_file)
+    timings["load face gallery"] = time.perf_counter() - start
+
+    return timings
+
+def quality_settings(quality):
+    """
+    Look up the current quality settings.
+
+    Args:
+        quality (Value): Shared index into QUALITY_LEVELS, or None for full quality.
+
+    Returns:
+        dict: Settings with "scale", "cadence", "backend" and "fps" keys.
+    """
+    if quality is None:
+        return QUALITY_LEVELS[0]
+    return QUALITY_LEVELS[min(max(quality.value, 0), len(QUALITY_LEVELS) - 1)]
+
+def finish_frame(frame_start, settings, frame_latency):
+    """
+    Report how long the frame took and sleep to keep to the frame rate limit.
+
+    Args:
+        frame_start (float): time.perf_counter() value when the frame was captured.
+        settings (dict): Current quality settings.
+        frame_latency (Value): Shared average frame processing time in milliseconds, or None.
+    """
+    elapsed = time.perf_counter() - frame_start
+    if frame_latency is not None:
+        frame_latency.value += LATENCY_SMOOTHING * (elapsed * 1000.0 - frame_latency.value)
+
+    remaining = 1.0 / settings["fps"] - elapsed
+    if remaining > 0:
+        time.sleep(remaining)
+
+def detect_faces(rgb_frame, settings, cascade):
+    """
+    Find face locations using the backend and resolution from the quality settings.
+
+    Args:
+        rgb_frame (ndarray): Full resolution RGB frame.
+        settings (dict): Current quality settings.
+        cascade (CascadeClassifier): Haar cascade for the "haar" backend.
+
+    Returns:
+        tuple: (small_frame, small_locations, locations) where small_locations index into the
+               downscaled frame and locations are scaled back to the full frame.
+    """
+    import cv2  # OpenCV library for camera and image processing
+    import face_recognition  # Library for face detection and recognition
+
+    scale = settings["scale"]
+    small_frame = rgb_frame if scale == 1.0 else cv2.resize(rgb_frame, (0, 0), fx=scale, fy=scale)
+
+    if settings["backend"] == "haar":
+        gray_frame = cv2.cvtColor(small_frame, cv2.COLOR_RGB2GRAY)
+        boxes = cascade.detectMultiScale(gray_frame, scaleFactor=1.1, minNeighbors=5)
+        small_locations = [(int(y), int(x + w), int(y + h), int(x)) for (x, y, w, h) in boxes]
+    else:
+        small_locations = face_recognition.face_locations(small_frame)
+
+    locations = [tuple(int(value / scale) for value in location) for location in small_locations]
+    return small_frame, small_locations, locations
+
+def feed_should_stop(mode, feed_mode, active):
+    """
+    Check whether a camera feed should return.
+
+    Args:
+        mode (Value): Shared camera mode, or None.
+        feed_mode (int): Camera mode the feed belongs to.
+        active (Value): Shared flag that is 0 once the camera stream has been stopped, or None.
+
+    Returns:
+        bool: True if another camera mode is selected or the stream has been stopped.
+    """
+    return (mode is not None and mode.value != feed_mode) or (active is not None and active.value == 0)
+
+def simple_camera_feed(quality=None, frame_latency=None, mode=None, active=None):
     """
     Display a simple live camera feed without any additional processing.
     Opens the default camera and streams the video feed in a window.
+
+    Args:
+        quality (Value): Shared index into QUALITY_LEVELS, used for the frame rate limit.
+        frame_latency (Value): Shared average frame processing time in milliseconds.
+        mode (Value): Shared camera mode. The feed returns when it is no longer 0.
+        active (Value): Shared flag. The feed returns when it is set to 0.
     """
+    import cv2  # OpenCV library for camera and image processing
+
     cap = cv2.VideoCapture(0)  # Open the default camera (index 0)
     if not cap.isOpened():  # Check if the camera is accessible
         print("Error: Could not open camera.")
@@ -20,42 +176,53 @@ def simple_camera_feed():
             if not ret:  # Handle frame capture errors
                 print("Error: Could not read frame.")
                 break
+            frame_start = time.perf_counter()
 
             # Display the frame in a window
             cv2.imshow("Camera Stream", frame)
 
-            # Exit the loop if the user presses 'q'
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            # Exit the loop if the user presses 'q' or another camera mode is selected
+            if cv2.waitKey(1) & 0xFF == ord('q') or feed_should_stop(mode, 0, active):
                 break
+
+            finish_frame(frame_start, quality_settings(quality), frame_latency)
     finally:
         # Release the camera resource and close the display window
         cap.release()
         cv2.destroyAllWindows()
 
-def face_detection_feed(known_faces_file="face_encodings.json"):
+def face_detection_feed(known_faces_file=KNOWN_FACES_FILE, quality=None, frame_latency=None, mode=None,
+                        detections=None, active=None):
     """
     Display a live camera feed with face detection and recognition.
     - Detects faces in the camera feed and compares them against known encodings.
     - Annotates the video stream with bounding boxes and names of recognized faces.
+    - Follows the quality governor's detection resolution, cadence, backend and frame rate.
+    - Publishes each frame's detections to the detection channel for driving modes.
 
     Args:
         known_faces_file (str): Path to the JSON file containing known face encodings.
+        quality (Value): Shared index into QUALITY_LEVELS, or None for full quality.
+        frame_latency (Value): Shared average frame processing time in milliseconds.
+        mode (Value): Shared camera mode. The feed returns when it is no longer 1.
+        detections (SharedMemory): Detection channel to publish to, or None.
+        active (Value): Shared flag. The feed returns when it is set to 0.
     """
+    import cv2  # OpenCV library for camera and image processing
+    import face_recognition  # Library for face detection and recognition
+
     # Load known face encodings and names from the provided JSON file
-    known_names, known_encodings = [], []
-    try:
-        with open(known_faces_file, "r") as f:
-            data = json.load(f)
-            for entry in data:
-                known_names.append(entry["name"])
-                known_encodings.append(entry["encoding"])
-    except FileNotFoundError:
-        print("No face encodings file found. Starting detection-only mode.")  # Fallback to detection without recognition
+    known_names, known_encodings = load_known_faces(known_faces_file)
+    cascade = cv2.CascadeClassifier(HAAR_CASCADE_FILE)  # Lightweight detector for reduced quality levels
 
     cap = cv2.VideoCapture(0)  # Open the default camera (index 0)
     if not cap.isOpened():  # Check if the camera is accessible
         print("Error: Could not open camera.")
         return
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Keep only the newest frame so detections are not based on stale images
+
+    frame_count = 0  # Frames captured so far, used for the detection cadence
+    faces = []  # Latest detections as (location, name) pairs, reused between detection frames
 
     try:
         while True:
@@ -64,23 +231,35 @@ def face_detection_feed(known_faces_file="face_encodings.json"):
             if not ret:  # Handle frame capture errors
                 print("Error: Could not read frame.")
                 break
+            capture_time = time.monotonic()  # Start of the glass-to-motor latency measurement
+            frame_start = time.perf_counter()
+            settings = quality_settings(quality)
+
+            # Only run detection every few frames when the governor asks for it
+            if frame_count % settings["cadence"] == 0:
+                # Convert the frame from BGR to RGB for face_recognition compatibility
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
-            # Convert the frame from BGR to RGB for face_recognition compatibility
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                # Detect face locations and encodings in the frame
+                small_frame, small_locations, face_locations = detect_faces(rgb_frame, settings, cascade)
+                face_encodings = face_recognition.face_encodings(small_frame, small_locations)
 
-            # Detect face locations and encodings in the frame
-            face_locations = face_recognition.face_locations(rgb_frame)
-            face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
+                # Process each detected face
+                faces = []
+                for location, face_encoding in zip(face_locations, face_encodings):
+                    matches = face_recognition.compare_faces(known_encodings, face_encoding, tolerance=0.6)
+                    name = "Unknown"  # Default to "Unknown" if no match is found
 
-            # Process each detected face
-            for (top, right, bottom, left), face_encoding in zip(face_locations, face_encodings):
-                matches = face_recognition.compare_faces(known_encodings, face_encoding, tolerance=0.6)
-                name = "Unknown"  # Default to "Unknown" if no match is found
+                    if True in matches:  # Check if any known face matches the current face
+                        match_index = matches.index(True)
+                        name = known_names[match_index]  # Get the name of the matched face
+                    faces.append((location, name))
 
-                if True in matches:  # Check if any known face matches the current face
-                    match_index = matches.index(True)
-                    name = known_names[match_index]  # Get the name of the matched face
+                if detections is not None:
+                    publish_detections(detections, faces, capture_time, frame.shape[1], frame.shape[0])
+            frame_count += 1
 
+            for (top, right, bottom, left), name in faces:
                 # Draw a bounding box around the face
                 cv2.rectangle(frame, (left, top), (right, bottom), (0, 255, 0), 2)
                 # Add a label with the person's name
@@ -89,30 +268,46 @@ def face_detection_feed(known_faces_file="face_encodings.json"):
             # Display the annotated frame in a window
             cv2.imshow("Face Detection Stream", frame)
 
-            # Exit the loop if the user presses 'q'
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            # Exit the loop if the user presses 'q' or another camera mode is selected
+            if cv2.waitKey(1) & 0xFF == ord('q') or feed_should_stop(mode, 1, active):
                 break
+
+            finish_frame(frame_start, settings, frame_latency)
     finally:
         # Release the camera resource and close the display window
         cap.release()
         cv2.destroyAllWindows()
 
-def camera_stream(mode):
+def camera_stream(mode, quality=None, frame_latency=None, detections=None, active=None, prewarm_queue=None):
     """
     Dynamically run a camera stream based on the selected mode.
     - Mode 0: Simple camera feed.
     - Mode 1: Face detection feed.
+    The process can be started idle at launch: it prewarms the models, reports the timings and
+    known names on prewarm_queue, then waits until active is set to 1 before opening the camera.
 
     Args:
         mode (Value): A shared multiprocessing variable indicating the mode.
                       0 = Simple Stream
                       1 = Face Detection Stream
+        quality (Value): Shared index into QUALITY_LEVELS, set by the quality governor.
+        frame_latency (Value): Shared average frame processing time in milliseconds, read by the governor.
+        detections (SharedMemory): Detection channel that the face detection feed publishes to.
+        active (Value): Shared flag, 1 while the stream should run and 0 to idle. None always runs.
+        prewarm_queue (Queue): Receives (timings, known_names) once the models are loaded, or None to skip the prewarm.
     """
+    if prewarm_queue is not None:
+        timings = prewarm_models()
+        prewarm_queue.put((timings, load_known_faces()[0]))
+
     while True:
-        if mode.value == 0:  # Simple camera stream
-            simple_camera_feed()
+        if active is not None and active.value == 0:
+            time.sleep(IDLE_POLL)  # Keep the loaded models and wait for the stream to be started
+        elif mode.value == 0:  # Simple camera stream
+            simple_camera_feed(quality, frame_latency, mode, active)
         elif mode.value == 1:  # Face detection stream
-            face_detection_feed()
+            face_detection_feed(quality=quality, frame_latency=frame_latency, mode=mode, detections=detections,
+                                active=active)
         else:
             print("Invalid mode selected.")  # Handle invalid mode values
             break
\ No newline at end of file
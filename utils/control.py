@@ -0,0 +1,303 @@
+import os  # For Linux real-time scheduling and CPU affinity
+import sys  # For shortening the interpreter's thread switch interval
+import threading  # Runs the control loop in its own thread
+import time  # For the loop period, deadman timing and latency measurements
+from utils.motors import move_forward, move_backward, turn_left, turn_right, stop_motors, validate_speed  # Motor control functions
+
+# Control loop settings
+CONTROL_PERIOD_MS = 20  # How often the control loop applies the latest command (50 Hz)
+DEADMAN_MS = 300  # Motors stop if no fresh command arrives within this many milliseconds
+REALTIME_PRIORITY = 50  # SCHED_FIFO priority used when real-time scheduling is enabled
+REALTIME_SWITCH_INTERVAL = 0.001  # GIL switch interval in seconds while real-time scheduling is enabled
+
+# Motor functions for each command the control loop accepts
+COMMANDS = {
+    "forward": move_forward,
+    "backward": move_backward,
+    "left": turn_left,
+    "right": turn_right,
+    "stop": None,  # Handled by stop_motors()
+}
+
+# Global variables
+control_thread = None  # Thread running the control loop
+control_running = False  # Flag to indicate whether the control loop is active
+control_period = CONTROL_PERIOD_MS / 1000.0  # Loop period in seconds, set by start_control_loop()
+command_lock = threading.Lock()  # Protects latest_command between mode threads and the control loop
+latest_command = None  # Most recent command as (action, speed, sent_time, origin_time)
+motors_overridden = False  # Set when the motors were stopped outside the loop, so it must rewrite them
+previous_switch_interval = None  # GIL switch interval to restore when the loop stops, if it was shortened
+control_stats = {}  # Timing statistics, see reset_control_stats()
+
+def reset_control_stats():
+    """
+    Clear the control loop timing statistics.
+    """
+    global control_stats
+    control_stats = {
+        "ticks": 0,  # Number of control loop iterations
+        "missed_deadlines": 0,  # Iterations that started more than one period late
+        "worst_lateness_ms": 0.0,  # Largest delay between when an iteration was due and when it ran
+        "commands_applied": 0,  # Number of fresh commands picked up by the loop
+        "worst_command_latency_ms": 0.0,  # Largest delay between send_command() and the motors being set
+        "deadman_trips": 0,  # Number of times the motors were stopped because commands went stale
+        "last_glass_to_motor_ms": None,  # Delay from camera capture to the motors being set, for the latest motor write
+        "worst_glass_to_motor_ms": None,  # Largest delay from camera capture to the motors being set
+    }
+
+reset_control_stats()
+
+def get_control_stats():
+    """
+    Return a copy of the control loop timing statistics.
+
+    Returns:
+        dict: Counters and worst-case timings, see reset_control_stats().
+    """
+    return dict(control_stats)
+
+def control_report():
+    """
+    Build a one-line summary of the control loop timing statistics.
+
+    Returns:
+        str: Readable summary of missed deadlines, latency and deadman trips.
+    """
+    stats = get_control_stats()
+    report = (f"Control loop: {stats['ticks']} ticks, {stats['missed_deadlines']} missed deadlines "
+              f"(worst {stats['worst_lateness_ms']:.1f} ms late), {stats['commands_applied']} commands "
+              f"(worst latency {stats['worst_command_latency_ms']:.1f} ms), "
+              f"{stats['deadman_trips']} deadman stops")
+    if stats["worst_glass_to_motor_ms"] is not None:
+        report += f", worst glass-to-motor {stats['worst_glass_to_motor_ms']:.1f} ms"
+    return report
+
+def apply_command(action, speed):
+    """
+    Drive the motors according to a command.
+
+    Args:
+        action (str): One of the keys of COMMANDS.
+        speed (float): Motor speed from 0.0 to 1.0 (ignored for "stop").
+    """
+    if action == "stop":
+        stop_motors()
+    else:
+        COMMANDS[action](speed)
+
+def record_glass_to_motor(origin_time):
+    """
+    Record the delay from a camera capture to the motors being set.
+
+    Args:
+        origin_time (float): time.monotonic() value when the frame behind the command was captured.
+    """
+    latency = (time.monotonic() - origin_time) * 1000.0
+    control_stats["last_glass_to_motor_ms"] = latency
+    control_stats["worst_glass_to_motor_ms"] = max(control_stats["worst_glass_to_motor_ms"] or 0.0, latency)
+
+def send_command(action, speed=0.0, origin_time=None):
+    """
+    Send a motor command to the control loop.
+    The command must be refreshed more often than DEADMAN_MS or the motors stop.
+    If the control loop is not running, the command is applied immediately.
+
+    Args:
+        action (str): "forward", "backward", "left", "right" or "stop".
+        speed (float): Motor speed from 0.0 to 1.0.
+        origin_time (float): Optional time.monotonic() capture time of the camera frame the command
+                             is based on, used to measure glass-to-motor latency.
+    Raises:
+        ValueError: If the action is not a known command or the speed is out of range.
+    """
+    global latest_command
+    if action not in COMMANDS:
+        raise ValueError(f"Invalid command {action}. Command must be one of {', '.join(COMMANDS)}.")
+    validate_speed(speed)  # Reject bad speeds here rather than inside the control loop
+
+    if not control_running:
+        apply_command(action, speed)
+        if origin_time is not None:
+            record_glass_to_motor(origin_time)
+        return
+
+    with command_lock:
+        latest_command = (action, speed, time.perf_counter(), origin_time)
+
+def emergency_stop():
+    """
+    Stop the motors immediately, from any thread.
+    Use this instead of calling stop_motors() directly while the control loop may be running:
+    it also replaces the pending command with a stop and makes the loop forget what it last
+    wrote, so the next command is written to the motors even if it matches the one before the stop.
+    """
+    global latest_command, motors_overridden
+    with command_lock:
+        if control_running:
+            latest_command = ("stop", 0.0, time.perf_counter(), None)
+        motors_overridden = True
+    stop_motors()
+
+def hold_command(action, speed, duration):
+    """
+    Keep sending the same command for a period of time.
+    Use this instead of sleeping after a command, which would trip the deadman.
+
+    Args:
+        action (str): "forward", "backward", "left", "right" or "stop".
+        speed (float): Motor speed from 0.0 to 1.0.
+        duration (float): How long to hold the command, in seconds.
+    """
+    end_time = time.perf_counter() + duration
+    while True:
+        send_command(action, speed)
+        remaining = end_time - time.perf_counter()
+        if remaining <= 0:
+            break
+        time.sleep(min(control_period, remaining))
+
+def configure_thread(realtime=False, priority=REALTIME_PRIORITY, cpus=None):
+    """
+    Optionally give the calling thread Linux real-time scheduling and pin it to CPUs.
+    Failures (e.g., missing permissions or a non-Linux system) are reported and ignored.
+
+    Args:
+        realtime (bool): Whether to request SCHED_FIFO scheduling.
+        priority (int): SCHED_FIFO priority from 1 to 99.
+        cpus (set): CPU numbers to pin the thread to, or None to leave affinity unchanged.
+
+    Returns:
+        bool: True if real-time scheduling was enabled.
+    """
+    if cpus:
+        try:
+            os.sched_setaffinity(0, cpus)  # 0 means the calling thread on Linux
+            print(f"Control loop pinned to CPUs {sorted(cpus)}.")
+        except (AttributeError, OSError) as e:
+            print(f"Could not set control loop CPU affinity: {e}")
+
+    if not realtime:
+        return False
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        print(f"Control loop running with real-time priority {priority}.")
+        return True
+    except (AttributeError, OSError) as e:
+        print(f"Could not enable real-time scheduling for the control loop: {e}")
+        return False
+
+def control_loop(deadman, realtime, priority, cpus):
+    """
+    Apply the latest command once per period and stop the motors when commands go stale.
+
+    Args:
+        deadman (float): Deadman timeout in seconds.
+        realtime (bool): Whether to request real-time scheduling for this thread.
+        priority (int): SCHED_FIFO priority used when realtime is True.
+        cpus (set): CPU numbers to pin this thread to, or None.
+    """
+    global previous_switch_interval, motors_overridden
+    if configure_thread(realtime, priority, cpus):
+        # Shorten the GIL switch interval so the loop waits less for other Python threads.
+        # This is process-wide, so stop_control_loop() puts the old value back.
+        previous_switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(REALTIME_SWITCH_INTERVAL)
+
+    stop_motors()  # Start from a known state
+    applied_command = None  # (action, speed) currently on the motors
+    last_sent_time = None  # Send time of the last command picked up, to tell fresh commands from repeats
+    stopped_by_deadman = True  # Nothing has been commanded yet, so the motors are already stopped
+    next_tick = time.perf_counter()
+
+    while control_running:
+        now = time.perf_counter()
+
+        # Track how late this iteration started
+        lateness = now - next_tick
+        control_stats["ticks"] += 1
+        control_stats["worst_lateness_ms"] = max(control_stats["worst_lateness_ms"], lateness * 1000.0)
+        if lateness > control_period:
+            control_stats["missed_deadlines"] += 1
+
+        with command_lock:
+            command = latest_command
+            if motors_overridden:
+                # emergency_stop() wrote to the motors, so what was last applied is no longer on them
+                applied_command = None
+                motors_overridden = False
+
+        if command and now - command[2] <= deadman:
+            action, speed, sent_time, origin_time = command
+            if sent_time != last_sent_time:
+                # Only write to the motors when the command actually changes
+                if (action, speed) != applied_command:
+                    apply_command(action, speed)
+                    applied_command = (action, speed)
+                    # Glass-to-motor only counts detections that actually changed what the motors do
+                    if origin_time is not None:
+                        record_glass_to_motor(origin_time)
+                latency = (time.perf_counter() - sent_time) * 1000.0
+                last_sent_time = sent_time
+                control_stats["commands_applied"] += 1
+                control_stats["worst_command_latency_ms"] = max(control_stats["worst_command_latency_ms"], latency)
+            stopped_by_deadman = False
+        elif not stopped_by_deadman:
+            # No fresh command within the deadman timeout. A deliberate stop that has simply
+            # gone stale is not a stall, so only count a trip if the motors were still driving.
+            if applied_command is not None and applied_command[0] != "stop":
+                stop_motors()
+                control_stats["deadman_trips"] += 1
+                print("Deadman timeout: no fresh motor command, motors stopped.")
+            applied_command = None
+            stopped_by_deadman = True
+
+        # Sleep until the next period, skipping ahead if this iteration overran
+        next_tick += control_period
+        sleep_time = next_tick - time.perf_counter()
+        if sleep_time > 0:
+            time.sleep(sleep_time)
+        else:
+            next_tick = time.perf_counter()
+
+    stop_motors()  # Never leave the motors running when the loop exits
+
+def start_control_loop(period_ms=CONTROL_PERIOD_MS, deadman_ms=DEADMAN_MS, realtime=False,
+                       priority=REALTIME_PRIORITY, cpus=None):
+    """
+    Start the control loop thread if it is not already running.
+    With realtime=True the thread asks for SCHED_FIFO scheduling, which needs root or CAP_SYS_NICE.
+    If that succeeds, the GIL switch interval is also shortened until the loop stops.
+
+    Args:
+        period_ms (float): Loop period in milliseconds.
+        deadman_ms (float): Motors stop if no fresh command arrives within this many milliseconds.
+        realtime (bool): Whether to request Linux real-time scheduling.
+        priority (int): SCHED_FIFO priority from 1 to 99.
+        cpus (set): CPU numbers to pin the loop to (e.g., {3}), or None.
+    """
+    global control_thread, control_running, control_period, latest_command
+    if control_thread and control_thread.is_alive():
+        return
+
+    control_period = period_ms / 1000.0
+    latest_command = None
+    reset_control_stats()
+
+    control_running = True
+    control_thread = threading.Thread(target=control_loop, args=(deadman_ms / 1000.0, realtime, priority, cpus),
+                                      daemon=True)
+    control_thread.start()
+
+def stop_control_loop():
+    """
+    Stop the control loop thread and the motors.
+    """
+    global control_thread, control_running, previous_switch_interval
+    control_running = False
+    if control_thread and control_thread.is_alive():
+        control_thread.join()
+    control_thread = None
+    if previous_switch_interval is not None:
+        sys.setswitchinterval(previous_switch_interval)
+        previous_switch_interval = None
+    stop_motors()
@@ -0,0 +1,110 @@
+import struct  # For packing detections into shared memory
+import time  # For timestamps and read retries
+from multiprocessing import shared_memory  # Shared memory block visible to the camera process and the modes
+
+# Latest-value detection channel between the camera process (single writer) and driving modes (readers).
+# It is a seqlock: the writer makes the sequence number odd, writes the slot, then makes it even again.
+# A reader copies the slot and only accepts it if the sequence number was even and unchanged,
+# so neither side ever blocks or waits on a lock, and readers always see the newest detections.
+# All timestamps use time.monotonic(), which is shared by every process on the machine.
+
+MAX_FACES = 8  # Maximum number of faces stored per frame
+NAME_LENGTH = 32  # Bytes reserved for each face name (UTF-8, truncated if longer)
+HEADER_FORMAT = "=QddIII4x"  # sequence, capture time, publish time, frame width, frame height, face count
+FACE_FORMAT = f"={NAME_LENGTH}sffff"  # name, then top, right, bottom, left as fractions of the frame size
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+FACE_SIZE = struct.calcsize(FACE_FORMAT)
+CHANNEL_SIZE = HEADER_SIZE + MAX_FACES * FACE_SIZE
+READ_RETRIES = 100  # Attempts before giving up on a read that keeps overlapping a write
+
+def create_detection_channel():
+    """
+    Create a new, empty detection channel in shared memory.
+    Pass the returned object to the camera process and the modes that read detections.
+
+    Returns:
+        SharedMemory: The shared memory block holding the channel.
+    """
+    channel = shared_memory.SharedMemory(create=True, size=CHANNEL_SIZE)
+    channel.buf[:CHANNEL_SIZE] = bytes(CHANNEL_SIZE)  # Sequence 0 means nothing has been published yet
+    return channel
+
+def close_detection_channel(channel):
+    """
+    Release the detection channel's shared memory.
+
+    Args:
+        channel (SharedMemory): Channel created by create_detection_channel().
+    """
+    channel.close()
+    channel.unlink()
+
+def publish_detections(channel, faces, capture_time, frame_width, frame_height):
+    """
+    Publish the detections for one frame, replacing the previous ones.
+    Only one process may publish to a channel.
+
+    Args:
+        channel (SharedMemory): Channel created by create_detection_channel().
+        faces (list): (location, name) pairs, where location is (top, right, bottom, left) in pixels.
+        capture_time (float): time.monotonic() value when the frame was captured.
+        frame_width (int): Width of the frame in pixels.
+        frame_height (int): Height of the frame in pixels.
+    """
+    buf = channel.buf
+    faces = faces[:MAX_FACES]
+    seq = struct.unpack_from("=Q", buf, 0)[0]
+    seq += seq & 1  # A writer killed mid-publish leaves an odd sequence, so round up to even first
+
+    struct.pack_into("=Q", buf, 0, seq + 1)  # Odd sequence: write in progress
+
+    for index, ((top, right, bottom, left), name) in enumerate(faces):
+        struct.pack_into(FACE_FORMAT, buf, HEADER_SIZE + index * FACE_SIZE,
+                         name.encode("utf-8")[:NAME_LENGTH],
+                         top / frame_height, right / frame_width, bottom / frame_height, left / frame_width)
+    struct.pack_into(HEADER_FORMAT, buf, 0, seq + 1, capture_time, time.monotonic(),
+                     frame_width, frame_height, len(faces))
+
+    struct.pack_into("=Q", buf, 0, seq + 2)  # Even sequence: slot is consistent again
+
+def read_detections(channel):
+    """
+    Read the latest detections without blocking the camera process.
+
+    Args:
+        channel (SharedMemory): Channel created by create_detection_channel().
+
+    Returns:
+        dict: "seq", "capture_time", "publish_time", "frame_width", "frame_height" and "faces",
+              a list of (name, (top, right, bottom, left)) with coordinates as fractions of the frame.
+              None if nothing has been published yet or no consistent copy could be read.
+    """
+    buf = channel.buf
+    for _ in range(READ_RETRIES):
+        seq_before = struct.unpack_from("=Q", buf, 0)[0]
+        if seq_before == 0:
+            return None  # Nothing published yet
+        if seq_before % 2 == 1:
+            time.sleep(0)  # Writer is mid-update, let it finish
+            continue
+
+        snapshot = bytes(buf[:CHANNEL_SIZE])  # Copy the whole slot, then check it was not overwritten
+        seq_after = struct.unpack_from("=Q", buf, 0)[0]
+        if seq_after != seq_before:
+            continue
+
+        _, capture_time, publish_time, frame_width, frame_height, count = struct.unpack_from(HEADER_FORMAT, snapshot, 0)
+        faces = []
+        for index in range(min(count, MAX_FACES)):
+            name, top, right, bottom, left = struct.unpack_from(FACE_FORMAT, snapshot, HEADER_SIZE + index * FACE_SIZE)
+            faces.append((name.rstrip(b"\0").decode("utf-8", errors="ignore"), (top, right, bottom, left)))
+
+        return {
+            "seq": seq_before,
+            "capture_time": capture_time,
+            "publish_time": publish_time,
+            "frame_width": frame_width,
+            "frame_height": frame_height,
+            "faces": faces,
+        }
+    return None
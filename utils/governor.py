@@ -0,0 +1,216 @@
+import json  # For writing governor decisions as JSON lines
+import os  # For the CPU count and load average fallback
+import threading  # Runs the governor in its own thread
+import time  # For the governor interval and log timestamps
+from utils.control import get_control_stats  # Control loop overrun counter
+
+# Vision quality levels, from best quality (0) to lightest load (last)
+# - scale: Fraction of the frame resolution used for detection
+# - cadence: Run detection on every Nth frame and reuse the last results in between
+# - backend: "hog" (face_recognition, accurate) or "haar" (OpenCV cascade, much cheaper)
+# - fps: Maximum camera stream frame rate
+QUALITY_LEVELS = [
+    {"scale": 1.0, "cadence": 1, "backend": "hog", "fps": 30},
+    {"scale": 0.5, "cadence": 1, "backend": "hog", "fps": 30},
+    {"scale": 0.5, "cadence": 2, "backend": "hog", "fps": 20},
+    {"scale": 0.5, "cadence": 3, "backend": "haar", "fps": 15},
+    {"scale": 0.25, "cadence": 5, "backend": "haar", "fps": 10},
+]
+
+# Governor settings
+GOVERNOR_INTERVAL = 1.0  # Seconds between governor decisions
+GOVERNOR_LOG = "governor_log.jsonl"  # File that every decision is appended to
+UPGRADE_AFTER = 5  # Calm intervals in a row needed before raising quality by one level
+CONTROL_OVERRUN_STEP = 2  # Levels dropped at once when the control loop misses deadlines
+DOWNGRADE_COOLDOWN = 3  # Intervals to wait after lowering quality before other pressure can lower it again
+THERMAL_ZONE = "/sys/class/thermal/thermal_zone0/temp"  # SoC temperature in millidegrees Celsius
+
+# Thresholds with hysteresis: above the high value quality drops, below the low value it may rise
+TEMP_HIGH, TEMP_LOW = 75.0, 65.0  # SoC temperature in Celsius (the Pi 4 throttles at 80)
+CPU_HIGH, CPU_LOW = 0.90, 0.60  # Fraction of total CPU time in use
+LATENCY_HIGH_MS, LATENCY_LOW_MS = 200.0, 100.0  # Camera frame processing time in milliseconds
+
+# Global variables
+governor_thread = None  # Thread running the governor loop
+governor_running = False  # Flag to indicate whether the governor is active
+
+def read_temperature():
+    """
+    Read the SoC temperature from /sys.
+
+    Returns:
+        float: Temperature in Celsius, or None if it cannot be read.
+    """
+    try:
+        with open(THERMAL_ZONE, "r") as f:
+            return int(f.read().strip()) / 1000.0
+    except (OSError, ValueError):
+        return None
+
+def read_cpu_times():
+    """
+    Read the total and idle CPU time counters from /proc/stat.
+
+    Returns:
+        tuple: (total, idle) jiffies, or None if /proc/stat is unavailable.
+    """
+    try:
+        with open("/proc/stat", "r") as f:
+            values = [int(value) for value in f.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+    idle = values[3] + (values[4] if len(values) > 4 else 0)  # idle + iowait
+    return sum(values), idle
+
+def cpu_load(previous_times, current_times):
+    """
+    Compute the fraction of CPU time in use between two read_cpu_times() samples.
+    Falls back to the 1-minute load average when /proc/stat is unavailable.
+
+    Returns:
+        float: CPU load from 0.0 (idle) to 1.0 (fully busy).
+    """
+    if previous_times and current_times:
+        total = current_times[0] - previous_times[0]
+        idle = current_times[1] - previous_times[1]
+        if total > 0:
+            return (total - idle) / total
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0
+
+def decide_quality(level, calm_intervals, cooldown, signals):
+    """
+    Choose the next quality level from the latest measurements.
+    Missed control deadlines always lower quality and block any increase. Other pressure
+    lowers quality by one level, then waits DOWNGRADE_COOLDOWN intervals so slow signals such as
+    temperature can show the effect before dropping again. Quality only rises after
+    UPGRADE_AFTER calm intervals.
+
+    Args:
+        level (int): Current index into QUALITY_LEVELS.
+        calm_intervals (int): Calm intervals in a row so far.
+        cooldown (int): Intervals left before other pressure may lower quality again.
+        signals (dict): "control_overruns", "temperature", "cpu_load" and "frame_latency_ms".
+                        The temperature may be None when it cannot be read.
+
+    Returns:
+        tuple: (new_level, new_calm_intervals, new_cooldown, reason)
+    """
+    lowest_quality = len(QUALITY_LEVELS) - 1
+    temperature = signals["temperature"]
+
+    # Control deadlines win over everything else, including the cooldown
+    if signals["control_overruns"] > 0:
+        return (min(level + CONTROL_OVERRUN_STEP, lowest_quality), 0, DOWNGRADE_COOLDOWN,
+                "control loop missed deadlines")
+
+    pressure = None
+    if temperature is not None and temperature >= TEMP_HIGH:
+        pressure = "SoC temperature high"
+    elif signals["cpu_load"] >= CPU_HIGH:
+        pressure = "CPU load high"
+    elif signals["frame_latency_ms"] >= LATENCY_HIGH_MS:
+        pressure = "frame latency high"
+
+    if pressure:
+        if cooldown > 0:
+            return level, 0, cooldown - 1, f"{pressure}, waiting for the last change to take effect"
+        if level == lowest_quality:
+            return level, 0, 0, pressure
+        return level + 1, 0, DOWNGRADE_COOLDOWN, pressure
+
+    cooldown = max(cooldown - 1, 0)
+    calm = ((temperature is None or temperature < TEMP_LOW)
+            and signals["cpu_load"] < CPU_LOW
+            and signals["frame_latency_ms"] < LATENCY_LOW_MS)
+    if not calm:
+        return level, 0, cooldown, "holding between thresholds"
+
+    calm_intervals += 1
+    if calm_intervals >= UPGRADE_AFTER and level > 0:
+        return level - 1, 0, cooldown, "calm, raising quality"
+    return level, calm_intervals, cooldown, "calm"
+
+def log_decision(log_file, entry):
+    """
+    Append a governor decision to the log file as one line of JSON.
+
+    Args:
+        log_file (str): Path to the log file.
+        entry (dict): Decision details.
+    """
+    try:
+        with open(log_file, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        print(f"Error writing governor log: {e}")
+
+def governor_loop(quality, frame_latency, log_file):
+    """
+    Measure control overruns, frame latency, CPU load and temperature once per interval
+    and adjust the shared quality level.
+
+    Args:
+        quality (Value): Shared index into QUALITY_LEVELS, read by the camera process.
+        frame_latency (Value): Shared frame processing time in milliseconds, written by the camera process.
+        log_file (str): Path to the decision log.
+    """
+    calm_intervals = 0
+    cooldown = 0
+    previous_overruns = get_control_stats()["missed_deadlines"]
+    previous_cpu_times = read_cpu_times()
+
+    while governor_running:
+        time.sleep(GOVERNOR_INTERVAL)
+
+        # The counter restarts when a new mode starts, so treat a drop as a fresh count
+        overruns = get_control_stats()["missed_deadlines"]
+        new_overruns = overruns - previous_overruns if overruns >= previous_overruns else overruns
+        previous_overruns = overruns
+
+        cpu_times = read_cpu_times()
+        signals = {
+            "control_overruns": new_overruns,
+            "temperature": read_temperature(),
+            "cpu_load": cpu_load(previous_cpu_times, cpu_times),
+            "frame_latency_ms": frame_latency.value,
+        }
+        previous_cpu_times = cpu_times
+
+        level = quality.value
+        new_level, calm_intervals, cooldown, reason = decide_quality(level, calm_intervals, cooldown, signals)
+        if new_level != level:
+            quality.value = new_level
+            print(f"Vision quality {level} -> {new_level} ({reason}): {QUALITY_LEVELS[new_level]}")
+
+        log_decision(log_file, {"time": time.time(), "level": level, "new_level": new_level,
+                                "reason": reason, "cooldown": cooldown, **signals})
+
+def start_governor(quality, frame_latency, log_file=GOVERNOR_LOG):
+    """
+    Start the quality governor thread if it is not already running.
+
+    Args:
+        quality (Value): Shared index into QUALITY_LEVELS, read by the camera process.
+        frame_latency (Value): Shared frame processing time in milliseconds, written by the camera process.
+        log_file (str): Path to the decision log.
+    """
+    global governor_thread, governor_running
+    if governor_thread and governor_thread.is_alive():
+        return
+
+    governor_running = True
+    governor_thread = threading.Thread(target=governor_loop, args=(quality, frame_latency, log_file), daemon=True)
+    governor_thread.start()
+
+def stop_governor():
+    """
+    Stop the quality governor thread.
+    """
+    global governor_thread, governor_running
+    governor_running = False
+    if governor_thread and governor_thread.is_alive():
+        governor_thread.join()
+    governor_thread = None
@@ -1,7 +1,50 @@
-from adafruit_motorkit import MotorKit  # Library for controlling the Adafruit MotorHat
+import os  # For reading the simulated motors setting from the environment
 
-# Initialize the MotorHat
-kit = MotorKit()  # Create an instance of MotorKit to control the motors
+# The MotorHat is initialized on first use so that importing this module does not touch the I2C bus
+kit = None  # Instance of MotorKit (or SimulatedMotorKit), created by get_kit()
+
+class SimulatedMotor:
+    """
+    Stand-in for a MotorHat DC motor that only remembers its throttle.
+    """
+    def __init__(self):
+        self.throttle = None  # Same initial value as a real motor that has never been driven
+
+class SimulatedMotorKit:
+    """
+    Stand-in for MotorKit with four simulated motors, for testing without the hardware.
+    """
+    def __init__(self):
+        self.motor1 = SimulatedMotor()
+        self.motor2 = SimulatedMotor()
+        self.motor3 = SimulatedMotor()
+        self.motor4 = SimulatedMotor()
+
+def use_simulated_motors():
+    """
+    Replace the MotorHat with simulated motors.
+    Can also be enabled by setting the ROVER_SIMULATED_MOTORS environment variable to 1.
+    Returns:
+        SimulatedMotorKit: The simulated kit, whose motor throttles can be inspected.
+    """
+    global kit
+    kit = SimulatedMotorKit()
+    return kit
+
+def get_kit():
+    """
+    Return the MotorKit instance, creating it the first time a motor is driven.
+    Deferring the import and I2C setup keeps the GUI startup fast.
+    Returns:
+        MotorKit: The shared MotorKit instance.
+    """
+    global kit
+    if kit is None and os.environ.get("ROVER_SIMULATED_MOTORS") == "1":
+        use_simulated_motors()
+    if kit is None:
+        from adafruit_motorkit import MotorKit  # Library for controlling the Adafruit MotorHat
+        kit = MotorKit()  # Create an instance of MotorKit to control the motors
+    return kit
 
 def validate_speed(speed):
     """
@@ -21,6 +64,7 @@ def move_forward(speed=1.0):
         speed (float): Speed for the motors, from 0.0 (stop) to 1.0 (full speed).
     """
     validate_speed(speed)  # Ensure the speed is valid
+    kit = get_kit()  # Initialize the MotorHat if needed
     kit.motor1.throttle = speed  # Set motor 1 to move forward
     kit.motor2.throttle = speed  # Set motor 2 to move forward
     kit.motor3.throttle = speed  # Set motor 3 to move forward
@@ -33,6 +77,7 @@ def move_backward(speed=1.0):
         speed (float): Speed for the motors, from 0.0 (stop) to 1.0 (full speed).
     """
     validate_speed(speed)  # Ensure the speed is valid
+    kit = get_kit()  # Initialize the MotorHat if needed
     kit.motor1.throttle = -speed  # Set motor 1 to move backward
     kit.motor2.throttle = -speed  # Set motor 2 to move backward
     kit.motor3.throttle = -speed  # Set motor 3 to move backward
@@ -45,6 +90,7 @@ def turn_left(speed=1.0):
         speed (float): Speed for the turning motors, from 0.0 (stop) to 1.0 (full speed).
     """
     validate_speed(speed)  # Ensure the speed is valid
+    kit = get_kit()  # Initialize the MotorHat if needed
     kit.motor1.throttle = speed  # Set motor 1 to move forward
     kit.motor2.throttle = 0.25  # Slow down or stop motor 2 for the turn
     kit.motor3.throttle = speed  # Set motor 3 to move forward
@@ -57,6 +103,7 @@ def turn_right(speed=1.0):
         speed (float): Speed for the turning motors, from 0.0 (stop) to 1.0 (full speed).
     """
     validate_speed(speed)  # Ensure the speed is valid
+    kit = get_kit()  # Initialize the MotorHat if needed
     kit.motor1.throttle = 0.25  # Slow down or stop motor 1 for the turn
     kit.motor2.throttle = speed  # Set motor 2 to move forward
     kit.motor3.throttle = 0.25  # Slow down or stop motor 3 for the turn
@@ -66,6 +113,7 @@ def stop_motors():
     """
     Stop all motors by setting their throttle to 0.0.
     """
+    kit = get_kit()  # Initialize the MotorHat if needed
     kit.motor1.throttle = 0.0  # Stop motor 1
     kit.motor2.throttle = 0.0  # Stop motor 2
     kit.motor3.throttle = 0.0  # Stop motor 3
@@ -0,0 +1,38 @@
+import time  # For measuring how long each startup step takes
+
+# Time at which this module was first imported, used as the start of the startup profile
+start_time = time.perf_counter()
+
+# List of (step name, seconds since start) pairs recorded during startup
+startup_marks = []
+
+def mark_startup(step):
+    """
+    Record that a startup step has finished.
+
+    Args:
+        step (str): Name of the step that just finished (e.g., "GUI ready").
+    """
+    startup_marks.append((step, time.perf_counter() - start_time))
+
+def startup_report(prewarm_timings=None):
+    """
+    Build a readable report of the startup profile.
+
+    Args:
+        prewarm_timings (dict): Optional seconds spent on each background prewarm step.
+
+    Returns:
+        str: Multi-line report of elapsed times.
+    """
+    lines = ["Startup profile (seconds since launch):"]
+    for step, elapsed in startup_marks:
+        lines.append(f"  {elapsed:7.3f}  {step}")
+
+    if prewarm_timings:
+        lines.append("Background prewarm (seconds per step):")
+        for step, seconds in prewarm_timings.items():
+            lines.append(f"  {seconds:7.3f}  {step}")
+
+    lines.append("For a per-module import breakdown run: python -X importtime main.py")
+    return "\n".join(lines)